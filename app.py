@@ -2,31 +2,35 @@
 
 Architecture:
     Main thread  → NSStatusBar menu + IOBluetooth + NSRunLoop
-    Daemon thread → Flask HTTP server
+    Daemon thread → stdlib HTTP server (server.py, thread per connection)
 
 ALL Bluetooth operations (connect, disconnect, send_command) must run on
-the main thread. Flask routes and menu callbacks schedule them via
-run_on_main() / bt_queue.
+the main thread. HTTP views and menu callbacks schedule them via
+run_on_main() / schedule_on_main(), which queue the work and wake the
+main run loop.
 """
 
+import ctypes
+import functools
+import hashlib
 import logging
 import os
 import queue
+import subprocess
 import threading
+import time
+import uuid
 import webbrowser
+from concurrent.futures import Future
 
-import objc
-from AppKit import (
-    NSApplication,
-    NSImage,
-    NSMenu,
-    NSMenuItem,
-    NSObject,
-    NSStatusBar,
-    NSVariableStatusItemLength,
+from CoreFoundation import (
+    CFRunLoopGetMain,
+    CFRunLoopPerformBlock,
+    CFRunLoopWakeUp,
+    kCFRunLoopDefaultMode,
 )
 
-from flask import Flask, jsonify, render_template, request
+import orjson
 
 from bluetooth.connector import SonyBluetoothConnector
 from protocol.commands import (
@@ -46,6 +50,7 @@ from protocol.commands import (
     build_volume_set,
 )
 from protocol.constants import ANC_MODE_NAMES, EQ_PRESET_NAMES, AncMode
+from server import App, Request, Response, serve
 
 logging.basicConfig(
     level=logging.INFO,
@@ -55,224 +60,541 @@ log = logging.getLogger(__name__)
 
 # --- Shared state ---
 connector = SonyBluetoothConnector()
-# Queue for scheduling BT operations from Flask thread → main thread
-bt_queue: queue.Queue[tuple] = queue.Queue()
+# Queue for scheduling BT operations from HTTP threads → main thread.
+# SimpleQueue: unbounded, no task tracking, put() never blocks.
+bt_queue: queue.SimpleQueue = queue.SimpleQueue()
+_main_run_loop = CFRunLoopGetMain()
+_draining = False
+
+# State inquiries sent right after connecting
+_INITIAL_INQUIRIES = (
+    build_battery_inquiry(),
+    build_nc_asm_get(),
+    build_volume_get(),
+    build_dsee_get(),
+    build_speak_to_chat_get(),
+)
 
-app = Flask(__name__)
+# Menu bar ANC presets (default level / no focus)
+_ANC_PAYLOADS = {
+    AncMode.OFF: build_anc_command_xm6(AncMode.OFF),
+    AncMode.NOISE_CANCELLING: build_anc_command_xm6(AncMode.NOISE_CANCELLING),
+    AncMode.AMBIENT_SOUND: build_anc_command_xm6(AncMode.AMBIENT_SOUND),
+}
+
+# MRMediaRemoteCommand per playback action ("play" toggles, like the
+# Spotify "playpause" fallback below)
+_MEDIA_REMOTE_PATH = (
+    "/System/Library/PrivateFrameworks/MediaRemote.framework/MediaRemote"
+)
+_MEDIA_REMOTE_COMMANDS = {
+    "play": 2,   # kMRTogglePlayPause
+    "pause": 1,  # kMRPause
+    "next": 4,   # kMRNextTrack
+    "prev": 5,   # kMRPreviousTrack
+}
+
+# Fallback: osascript argv per playback action (Spotify AppleScript API).
+# Run as a child process: "tell application" can block for seconds
+# (launching Spotify, the Automation consent prompt), which must never
+# happen on the main thread.
+_PLAYBACK_ARGS = {
+    "play": ["osascript", "-e", 'tell application "Spotify" to playpause'],
+    "pause": ["osascript", "-e", 'tell application "Spotify" to pause'],
+    "next": ["osascript", "-e", 'tell application "Spotify" to next track'],
+    "prev": ["osascript", "-e", 'tell application "Spotify" to previous track'],
+}
+
+SSE_KEEPALIVE_INTERVAL = 15.0  # seconds between comments on an idle stream
 
 
 # ---------------------------------------------------------------------------
 # Helper: schedule a BT operation on the main thread
 # ---------------------------------------------------------------------------
 
-def run_on_main(fn, *args, timeout=10.0):
-    """Schedule a function to run on the main thread and wait for result.
+def _drain_bt_queue():
+    """Execute queued BT operations. Runs on the main thread's run loop."""
+    global _draining
+    if _draining:
+        # Nested run loop inside a BT operation (send_command pumps the
+        # run loop while waiting); the outer drain picks the work up.
+        return
+    _draining = True
+    try:
+        while True:
+            jobs = []
+            while True:
+                try:
+                    jobs.append(bt_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not jobs:
+                break
+
+            # Of several queued jobs of the same kind (e.g. a volume slider
+            # drag) only the newest is sent; older ones are superseded.
+            newest = {}
+            for i, fn in enumerate(jobs):
+                kind = getattr(fn, "kind", None)
+                if kind is not None:
+                    newest[kind] = i
+
+            for i, fn in enumerate(jobs):
+                kind = getattr(fn, "kind", None)
+                if kind is not None and newest[kind] != i:
+                    fn.coalesce()
+                    continue
+                try:
+                    fn()
+                except Exception:
+                    log.exception("Error in queued BT operation")
+    finally:
+        _draining = False
+
+
+def schedule_on_main(fn):
+    """Queue fn for the main thread and wake its run loop.
+
+    The main loop blocks on the run loop instead of polling bt_queue, so
+    the perform block is what gets queued work executed.
+    """
+    bt_queue.put(fn)
+    CFRunLoopPerformBlock(_main_run_loop, kCFRunLoopDefaultMode, _drain_bt_queue)
+    CFRunLoopWakeUp(_main_run_loop)
 
-    The main thread's run loop polls bt_queue and executes callables.
+
+# run_on_main() result of a job superseded by a newer one of the same kind
+COALESCED = object()
+
+
+class _Waiter:
+    """Per-thread result slot for run_on_main(), reused across calls.
+
+    The waiter itself is the callable put on bt_queue, so a call allocates
+    neither an Event nor a closure.
     """
-    result_event = threading.Event()
-    result_holder = [None, None]  # [result, exception]
 
-    def wrapper():
+    __slots__ = ("event", "job", "kind", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.job = None
+        self.kind = None
+        self.result = None
+        self.error = None
+
+    def coalesce(self):
+        """Complete without running: a newer job of this kind replaced it."""
+        self.result = COALESCED
+        self.event.set()
+
+    def __call__(self):
+        fn, args = self.job
         try:
-            result_holder[0] = fn(*args)
+            self.result = fn(*args)
         except Exception as exc:
-            result_holder[1] = exc
+            self.error = exc
         finally:
-            result_event.set()
+            self.event.set()
+
 
-    bt_queue.put(wrapper)
-    if result_event.wait(timeout=timeout):
-        if result_holder[1]:
-            raise result_holder[1]
-        return result_holder[0]
+_tls = threading.local()
+
+
+def run_on_main(fn, *args, timeout=10.0, kind=None):
+    """Schedule a function to run on the main thread and wait for result.
+
+    Safe to call from any number of HTTP worker threads at once: each
+    thread waits on its own _Waiter. Not re-entrant within one thread.
+
+    Jobs tagged with a kind may be coalesced: if a newer job of the same
+    kind is queued before this one runs, this one is skipped and returns
+    COALESCED.
+    """
+    waiter = getattr(_tls, "waiter", None)
+    if waiter is None:
+        waiter = _tls.waiter = _Waiter()
+    waiter.event.clear()
+    waiter.job = (fn, args)
+    waiter.kind = kind
+
+    schedule_on_main(waiter)
+    if waiter.event.wait(timeout=timeout):
+        result, error = waiter.result, waiter.error
+        waiter.job = waiter.result = waiter.error = None
+        if error is not None:
+            raise error
+        return result
+    # The main thread may still run the stale job later; don't let it
+    # write into the slot of this thread's next call.
+    _tls.waiter = None
     raise TimeoutError("Main-thread operation timed out")
 
 
-def send_cmd(payload: bytes) -> bool:
-    """Send a command via the main thread and return success."""
-    resp = run_on_main(connector.send_command, payload)
+def send_cmd(payload: bytes, kind: str | None = None) -> bool:
+    """Send a command via the main thread and return success.
+
+    Setters pass a kind so a burst of them only sends the last one; a
+    superseded command counts as successful.
+    """
+    resp = run_on_main(connector.send_command, payload, kind=kind)
     return resp is not None
 
 
+def run_on_main_async(fn, *args) -> Future:
+    """Schedule a function on the main thread without waiting for it."""
+    future = Future()
+
+    def job():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+
+    schedule_on_main(job)
+    return future
+
+
+def _request_initial_state():
+    """Query all cached state fields back-to-back (main thread)."""
+    for payload in _INITIAL_INQUIRIES:
+        connector.send_command(payload)
+
+
+def _connect_and_sync(address: str | None) -> tuple[dict, int]:
+    """Connect (first paired Sony device if no address) and fetch state.
+
+    Runs on the main thread; returns (response body, HTTP status).
+    """
+    if not address:
+        devices = connector.discover_sony_devices()
+        if not devices:
+            return {"error": "No Sony headphones found"}, 404
+        address = devices[0]["address"]
+
+    if not connector.connect(address):
+        return {"error": "Connection failed"}, 500
+    _request_initial_state()
+    return {"connected": True, "address": address}, 200
+
+
+def _list_devices() -> tuple[dict, int]:
+    """Paired Sony devices (main thread); returns (body, HTTP status)."""
+    return {"devices": connector.discover_sony_devices()}, 200
+
+
+@functools.cache
+def _media_remote_send_command():
+    """Resolve MRMediaRemoteSendCommand, or None if unavailable."""
+    try:
+        fn = ctypes.CDLL(_MEDIA_REMOTE_PATH).MRMediaRemoteSendCommand
+    except (OSError, AttributeError):
+        log.warning("MediaRemote unavailable, using osascript for playback")
+        return None
+    fn.argtypes = [ctypes.c_uint32, ctypes.c_void_p]
+    fn.restype = ctypes.c_bool
+    return fn
+
+
+def send_playback(action: str):
+    """Send a playback action to the system's Now Playing app.
+
+    MediaRemote is called in-process; osascript (Spotify) is only spawned
+    when the framework is missing or rejects the command.
+    """
+    send_command = _media_remote_send_command()
+    if send_command is not None and send_command(_MEDIA_REMOTE_COMMANDS[action], None):
+        return
+    subprocess.Popen(_PLAYBACK_ARGS[action],
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
 def send_cmd_nowait(payload: bytes) -> bool:
-    """Send a fire-and-forget command (no response expected)."""
-    resp = run_on_main(connector.send_command, payload, 0.5)
-    # For fire-and-forget, we consider it successful if the write didn't error
+    """Send a fire-and-forget command (no response expected).
+
+    Returns immediately. bt_queue is FIFO, so the command keeps its order
+    relative to other BT work, but its completion is not observable.
+    """
+    schedule_on_main(functools.partial(connector.send_command, payload, 0.0))
     return True
 
 
 # ---------------------------------------------------------------------------
-# Flask Routes
+# HTTP Routes
 # ---------------------------------------------------------------------------
 
-@app.route("/")
-def index():
-    return render_template("index.html")
+app = App()
 
 
-@app.route("/api/devices", methods=["GET"])
-def api_devices():
-    """List available Sony headphones."""
+def _json_body(request: Request) -> dict:
+    """Request body as a JSON object; {} if missing or not an object."""
     try:
-        devices = run_on_main(connector.discover_sony_devices)
-        return jsonify({"devices": devices})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
 
 
-@app.route("/api/connect", methods=["POST"])
-def api_connect():
-    """Connect to a Sony headphone by address."""
-    data = request.get_json(silent=True) or {}
-    address = data.get("address")
+def _json_response(obj, status: int = 200) -> Response:
+    """Serialize obj with orjson into an application/json response."""
+    return Response(orjson.dumps(obj), status=status, mimetype="application/json")
 
-    if not address:
-        try:
-            devices = run_on_main(connector.discover_sony_devices)
-        except Exception as e:
-            return jsonify({"error": str(e)}), 500
-        if not devices:
-            return jsonify({"error": "No Sony headphones found"}), 404
-        address = devices[0]["address"]
+
+# Web UI files: URL path -> (file relative to _BASE_DIR, mimetype).
+# index.html has no template markup, so it is served as-is.
+_WEB_ASSET_FILES = {
+    "/": ("templates/index.html", "text/html"),
+    "/static/style.css": ("static/style.css", "text/css"),
+    "/static/app.js": ("static/app.js", "text/javascript"),
+}
+
+
+@functools.cache
+def _web_assets() -> dict[str, tuple[bytes, str, str]]:
+    """The web UI files read once: URL path -> (body, mimetype, ETag)."""
+    assets = {}
+    for path, (filename, mimetype) in _WEB_ASSET_FILES.items():
+        with open(os.path.join(_BASE_DIR, filename), "rb") as f:
+            body = f.read()
+        assets[path] = (body, mimetype, hashlib.sha1(body).hexdigest())
+    return assets
+
+
+def _asset_response(request: Request, path: str) -> Response:
+    body, mimetype, etag = _web_assets()[path]
+    resp = Response(
+        body, mimetype=mimetype, headers={"Cache-Control": "public, max-age=300"}
+    )
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
+
+
+@app.route("/")
+def index(request):
+    return _asset_response(request, "/")
+
+
+@app.route("/static/<filename>")
+def static_file(request, filename):
+    path = f"/static/{filename}"
+    if path not in _WEB_ASSET_FILES:
+        return Response("Not Found", status=404)
+    return _asset_response(request, path)
+
+
+# Long-running BT jobs started over HTTP: id -> (future, completion time,
+# None while the job is still running)
+_jobs: dict[str, tuple[Future, float | None]] = {}
+_jobs_lock = threading.Lock()
+JOB_RETENTION = 300.0  # seconds a finished, never-fetched job is kept
+
+
+def _job_done(job_id: str, future: Future):
+    """Record when a job finished; its retention window starts here."""
+    with _jobs_lock:
+        if job_id in _jobs:
+            _jobs[job_id] = (future, time.monotonic())
+
+
+def _start_job(fn, *args):
+    """Run fn on the main thread and answer 202 with a job to poll."""
+    job_id = uuid.uuid4().hex
+    future = run_on_main_async(fn, *args)
+    now = time.monotonic()
+    with _jobs_lock:
+        for stale_id, (_, finished) in list(_jobs.items()):
+            if finished is not None and now - finished > JOB_RETENTION:
+                del _jobs[stale_id]
+        _jobs[job_id] = (future, None)
+    # Outside the lock: runs _job_done right away if fn already finished
+    future.add_done_callback(functools.partial(_job_done, job_id))
+    resp = _json_response({"job": job_id}, 202)
+    resp.headers["Location"] = f"/api/jobs/{job_id}"
+    return resp
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def api_job(request, job_id):
+    """Result of a job started by /api/devices or /api/connect."""
+    with _jobs_lock:
+        entry = _jobs.get(job_id)
+        if entry is None:
+            return _json_response({"error": f"Unknown job: {job_id}"}, 404)
+        future, _ = entry
+        if not future.done():
+            return _json_response({"pending": True})
+        del _jobs[job_id]
 
     try:
-        success = run_on_main(connector.connect, address, timeout=20.0)
-        if success:
-            # Request initial state — each goes through the main thread
-            send_cmd(build_battery_inquiry())
-            send_cmd(build_nc_asm_get())
-            send_cmd(build_volume_get())
-            send_cmd(build_dsee_get())
-            send_cmd(build_speak_to_chat_get())
-            return jsonify({"connected": True, "address": address})
-        return jsonify({"error": "Connection failed"}), 500
+        body, status = future.result()
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
+    return _json_response(body, status)
+
+
+@app.route("/api/devices", methods=["GET"])
+def api_devices(request):
+    """List available Sony headphones (as a job)."""
+    return _start_job(_list_devices)
+
+
+@app.route("/api/connect", methods=["POST"])
+def api_connect(request):
+    """Connect to a Sony headphone by address (as a job)."""
+    data = _json_body(request)
+    return _start_job(_connect_and_sync, data.get("address"))
 
 
 @app.route("/api/disconnect", methods=["POST"])
-def api_disconnect():
+def api_disconnect(request):
     """Disconnect from the headphones."""
     try:
         run_on_main(connector.disconnect)
-        return jsonify({"connected": False})
+        return _json_response({"connected": False})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
+
+
+# (State, JSON body, ETag) of the last serialized status
+_status_cache: tuple[object, bytes, str] = (None, b"", "")
+
+
+def _status_json() -> tuple[bytes, str]:
+    """Serialized status and its ETag, rebuilt only when the state changed."""
+    global _status_cache
+    cached_state, body, etag = _status_cache
+    state = connector.state
+    if state is not cached_state:
+        body = orjson.dumps(state)
+        etag = hashlib.sha1(body).hexdigest()
+        _status_cache = (state, body, etag)
+    return body, etag
 
 
 @app.route("/api/status", methods=["GET"])
-def api_status():
+def api_status(request):
     """Get current headphone status."""
-    return jsonify({
-        "connected": connector.connected,
-        "battery": connector.battery_level,
-        "charging": connector.battery_charging,
-        "anc_mode": connector.anc_mode,
-        "volume": connector.volume_level,
-        "dsee": connector.dsee_enabled,
-        "speak_to_chat": connector.speak_to_chat_enabled,
-    })
+    body, etag = _status_json()
+    resp = Response(
+        body, mimetype="application/json", headers={"Cache-Control": "no-cache"}
+    )
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
+
+
+@app.route("/api/status/stream", methods=["GET"])
+def api_status_stream(request):
+    """Push the status as Server-Sent Events whenever it changes."""
+    def events():
+        version = -1  # always send the current state first
+        while True:
+            new_version = connector.wait_for_state_change(
+                version, timeout=SSE_KEEPALIVE_INTERVAL
+            )
+            if new_version == version:
+                yield ": keepalive\n\n"
+                continue
+            version = new_version
+            body, _ = _status_json()
+            yield b"data: " + body + b"\n\n"
+
+    return Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @app.route("/api/anc", methods=["POST"])
-def api_anc():
+def api_anc(request):
     """Set ANC / Ambient Sound mode."""
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     mode_name = data.get("mode", "off")
     level = int(data.get("level", 10))
     focus = bool(data.get("focus", False))
 
     mode = ANC_MODE_NAMES.get(mode_name)
     if mode is None:
-        return jsonify({"error": f"Unknown mode: {mode_name}"}), 400
+        return _json_response({"error": f"Unknown mode: {mode_name}"}, 400)
 
     payload = build_anc_command_xm6(mode, asm_level=level, focus_voice=focus)
-    ok = send_cmd(payload)
-    return jsonify({"ok": ok, "mode": mode_name})
+    ok = send_cmd(payload, kind="anc")
+    return _json_response({"ok": ok, "mode": mode_name})
 
 
 @app.route("/api/eq", methods=["POST"])
-def api_eq():
+def api_eq(request):
     """Set EQ preset."""
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     preset_name = data.get("preset", "off")
 
     preset = EQ_PRESET_NAMES.get(preset_name)
     if preset is None:
-        return jsonify({"error": f"Unknown preset: {preset_name}"}), 400
+        return _json_response({"error": f"Unknown preset: {preset_name}"}, 400)
 
     payload = build_eq_preset(preset)
-    ok = send_cmd(payload)
-    return jsonify({"ok": ok, "preset": preset_name})
+    ok = send_cmd(payload, kind="eq")
+    return _json_response({"ok": ok, "preset": preset_name})
 
 
 @app.route("/api/volume", methods=["POST"])
-def api_volume():
+def api_volume(request):
     """Set volume level (0-30)."""
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     level = int(data.get("level", 15))
 
     payload = build_volume_set(level)
-    ok = send_cmd(payload)
-    return jsonify({"ok": ok, "level": level})
+    ok = send_cmd(payload, kind="volume")
+    return _json_response({"ok": ok, "level": level})
 
 
 @app.route("/api/dsee", methods=["POST"])
-def api_dsee():
+def api_dsee(request):
     """Enable/disable DSEE."""
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     enabled = bool(data.get("enabled", False))
 
     payload = build_dsee_set(enabled)
     ok = send_cmd(payload)
-    return jsonify({"ok": ok, "enabled": enabled})
+    return _json_response({"ok": ok, "enabled": enabled})
 
 
 @app.route("/api/speak-to-chat", methods=["POST"])
-def api_speak_to_chat():
+def api_speak_to_chat(request):
     """Enable/disable Speak-to-Chat."""
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     enabled = bool(data.get("enabled", False))
 
     payload = build_speak_to_chat_set(enabled)
     ok = send_cmd(payload)
-    return jsonify({"ok": ok, "enabled": enabled})
+    return _json_response({"ok": ok, "enabled": enabled})
 
 
 @app.route("/api/playback", methods=["POST"])
-def api_playback():
+def api_playback(request):
     """Playback control via macOS media keys (AVRCP goes through the OS)."""
-    import subprocess
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     action = data.get("action", "play")
 
-    # Use Spotify AppleScript API, fall back to generic media player
-    scripts = {
-        "play": 'tell application "Spotify" to playpause',
-        "pause": 'tell application "Spotify" to pause',
-        "next": 'tell application "Spotify" to next track',
-        "prev": 'tell application "Spotify" to previous track',
-    }
-    script = scripts.get(action)
-    if script is None:
-        return jsonify({"error": f"Unknown action: {action}"}), 400
+    if action not in _MEDIA_REMOTE_COMMANDS:
+        return _json_response({"error": f"Unknown action: {action}"}, 400)
 
     try:
-        subprocess.Popen(["osascript", "-e", script],
-                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        return jsonify({"ok": True, "action": action})
+        send_playback(action)
+        return _json_response({"ok": True, "action": action})
     except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 500
+        return _json_response({"ok": False, "error": str(e)}, 500)
 
 
 # ---------------------------------------------------------------------------
-# Flask server
+# HTTP server
 # ---------------------------------------------------------------------------
 
-def run_flask():
-    """Run Flask in a daemon thread."""
-    app.run(host="127.0.0.1", port=5050, debug=False, use_reloader=False)
+def run_server():
+    """Serve the web UI and API (call from a daemon thread)."""
+    serve(app, host="127.0.0.1", port=5050)
 
 
 # ---------------------------------------------------------------------------
@@ -280,98 +602,90 @@ def run_flask():
 # ---------------------------------------------------------------------------
 
 _quit_requested = False
+STATUS_REFRESH_INTERVAL = 1.0  # seconds between menu bar status refreshes
 _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_RESOURCE_DIRS = (os.path.join(_BASE_DIR, "resources"), _BASE_DIR)
 
 
+@functools.lru_cache(maxsize=32)
 def _resource_path(filename):
     """Locate a resource file (works as script and inside .app bundle)."""
-    for d in [os.path.join(_BASE_DIR, "resources"), _BASE_DIR]:
+    for d in _RESOURCE_DIRS:
         p = os.path.join(d, filename)
         if os.path.exists(p):
             return p
     return None
 
 
-class MenuBarDelegate(NSObject):
-    """Handles NSStatusBar menu item callbacks."""
-
-    def openWebUI_(self, sender):
-        webbrowser.open("http://localhost:5050")
-
-    def toggleConnection_(self, sender):
-        if connector.connected:
-            bt_queue.put(lambda: connector.disconnect())
-        else:
-            def _connect():
-                devices = connector.discover_sony_devices()
-                if devices:
-                    if connector.connect(devices[0]["address"]):
-                        connector.send_command(build_battery_inquiry())
-                        connector.send_command(build_nc_asm_get())
-                        connector.send_command(build_volume_get())
-                        connector.send_command(build_dsee_get())
-                        connector.send_command(build_speak_to_chat_get())
-            bt_queue.put(_connect)
-
-    def ancOff_(self, sender):
-        try:
-            log.info("Menu: ANC Off")
-            payload = build_anc_command_xm6(AncMode.OFF)
-            bt_queue.put(lambda: connector.send_command(payload))
-        except Exception:
-            log.exception("ancOff_ failed")
-
-    def ancNc_(self, sender):
-        try:
-            log.info("Menu: Noise Cancelling")
-            payload = build_anc_command_xm6(AncMode.NOISE_CANCELLING)
-            bt_queue.put(lambda: connector.send_command(payload))
-        except Exception:
-            log.exception("ancNc_ failed")
+@functools.cache
+def _menu_bar_delegate_class():
+    """Define MenuBarDelegate on first use.
 
-    def ancAmbient_(self, sender):
-        try:
-            log.info("Menu: Ambient Sound")
-            payload = build_anc_command_xm6(AncMode.AMBIENT_SOUND)
-            bt_queue.put(lambda: connector.send_command(payload))
-        except Exception:
-            log.exception("ancAmbient_ failed")
-
-    def playPrev_(self, sender):
-        import subprocess
-        subprocess.Popen(["osascript", "-e", 'tell application "Spotify" to previous track'],
-                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-    def playPause_(self, sender):
-        import subprocess
-        subprocess.Popen(["osascript", "-e", 'tell application "Spotify" to playpause'],
-                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-    def playNext_(self, sender):
-        import subprocess
-        subprocess.Popen(["osascript", "-e", 'tell application "Spotify" to next track'],
-                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-    def quitApp_(self, sender):
-        global _quit_requested
-        _quit_requested = True
-
-    @objc.python_method
-    def update_status(self, status_line, connect_item):
-        """Refresh the menu bar status text."""
-        if connector.connected:
-            bat = connector.battery_level
-            mode = (
-                connector.anc_mode.upper()
-                if connector.anc_mode != "unknown"
-                else "-"
-            )
-            chrg = " chrg" if connector.battery_charging else ""
-            status_line.setTitle_(f"Battery: {bat}%{chrg} | {mode}")
-            connect_item.setTitle_("Disconnect")
-        else:
-            status_line.setTitle_("Not connected")
-            connect_item.setTitle_("Connect")
+    NSObject subclasses need AppKit/objc at class-definition time; keeping
+    the class in a factory defers those imports to menu bar setup.
+    Cached because an Objective-C class can only be registered once.
+    """
+    import objc
+    from AppKit import NSObject
+
+    class MenuBarDelegate(NSObject):
+        """Handles NSStatusBar menu item callbacks."""
+
+        def openWebUI_(self, sender):
+            webbrowser.open("http://localhost:5050")
+
+        def toggleConnection_(self, sender):
+            if connector.connected:
+                schedule_on_main(connector.disconnect)
+            else:
+                schedule_on_main(functools.partial(_connect_and_sync, None))
+
+        def ancSelect_(self, sender):
+            try:
+                mode = AncMode(int(sender.representedObject()))
+                log.info("Menu: ANC %s", mode.name)
+                schedule_on_main(
+                    functools.partial(connector.send_command, _ANC_PAYLOADS[mode])
+                )
+            except Exception:
+                log.exception("ancSelect_ failed")
+
+        def playPrev_(self, sender):
+            send_playback("prev")
+
+        def playPause_(self, sender):
+            send_playback("play")
+
+        def playNext_(self, sender):
+            send_playback("next")
+
+        def quitApp_(self, sender):
+            global _quit_requested
+            _quit_requested = True
+
+        @objc.python_method
+        def update_status(self, status_line, connect_item):
+            """Refresh the menu bar status text if the state changed."""
+            version = connector.state_version
+            if version == getattr(self, "_status_version", None):
+                return
+            self._status_version = version
+            state = connector.state
+            if state.connected:
+                bat = state.battery
+                mode = (
+                    state.anc_mode.upper()
+                    if state.anc_mode != "unknown"
+                    else "-"
+                )
+                chrg = " chrg" if state.charging else ""
+                status_line.setTitle_(f"Battery: {bat}%{chrg} | {mode}")
+                connect_item.setTitle_("Disconnect")
+            else:
+                status_line.setTitle_("Not connected")
+                connect_item.setTitle_("Connect")
+
+    return MenuBarDelegate
 
 
 def setup_menu_bar():
@@ -379,17 +693,28 @@ def setup_menu_bar():
 
     Returns (delegate, status_line_item, connect_item).
     """
+    from AppKit import (
+        NSApplication,
+        NSImage,
+        NSMenu,
+        NSMenuItem,
+        NSStatusBar,
+        NSVariableStatusItemLength,
+    )
+
     ns_app = NSApplication.sharedApplication()
     ns_app.setActivationPolicy_(1)  # NSApplicationActivationPolicyAccessory
 
-    delegate = MenuBarDelegate.alloc().init()
+    delegate = _menu_bar_delegate_class().alloc().init()
 
     status_item = NSStatusBar.systemStatusBar().statusItemWithLength_(
         NSVariableStatusItemLength
     )
 
-    # Try to load template icon; fall back to text
-    icon_path = _resource_path("icon.png")
+    # Try to load template icon; fall back to text. The 44px image drawn
+    # at 22pt is sharp on Retina and downsampled on 1x displays, so it is
+    # the only menu bar image the bundle needs.
+    icon_path = _resource_path("icon@2x.png")
     if icon_path:
         icon = NSImage.alloc().initWithContentsOfFile_(icon_path)
         icon.setTemplate_(True)
@@ -408,24 +733,18 @@ def setup_menu_bar():
     menu.addItem_(status_line)
     menu.addItem_(NSMenuItem.separatorItem())
 
-    # -- ANC / Ambient controls --
-    anc_off_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(
-        "ANC Off", "ancOff:", ""
-    )
-    anc_off_item.setTarget_(delegate)
-    menu.addItem_(anc_off_item)
-
-    anc_nc_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(
-        "Noise Cancelling", "ancNc:", ""
-    )
-    anc_nc_item.setTarget_(delegate)
-    menu.addItem_(anc_nc_item)
-
-    anc_ambient_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(
-        "Ambient Sound", "ancAmbient:", ""
-    )
-    anc_ambient_item.setTarget_(delegate)
-    menu.addItem_(anc_ambient_item)
+    # -- ANC / Ambient controls (one action, mode in representedObject) --
+    for title, mode in (
+        ("ANC Off", AncMode.OFF),
+        ("Noise Cancelling", AncMode.NOISE_CANCELLING),
+        ("Ambient Sound", AncMode.AMBIENT_SOUND),
+    ):
+        anc_item = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(
+            title, "ancSelect:", ""
+        )
+        anc_item.setRepresentedObject_(int(mode))
+        anc_item.setTarget_(delegate)
+        menu.addItem_(anc_item)
     menu.addItem_(NSMenuItem.separatorItem())
 
     # -- Playback controls --
@@ -477,57 +796,69 @@ def setup_menu_bar():
 # Main entry point
 # ---------------------------------------------------------------------------
 
+QOS_CLASS_USER_INTERACTIVE = 0x21  # <sys/qos.h>
+
+
+def _raise_main_thread_qos():
+    """Run the calling (main) thread at user-interactive QoS.
+
+    The main thread services IOBluetooth callbacks and bt_queue, so it
+    should not queue behind the HTTP workers for CPU time.
+    """
+    try:
+        libsystem = ctypes.CDLL("/usr/lib/libSystem.dylib")
+        result = libsystem.pthread_set_qos_class_self_np(
+            QOS_CLASS_USER_INTERACTIVE, 0
+        )
+    except (OSError, AttributeError):
+        result = -1
+    if result != 0:
+        log.warning("Could not raise main thread QoS (%d)", result)
+
+
 def main():
-    """Main thread: menu bar + Flask server + event loop.
+    """Main thread: menu bar + HTTP server + event loop.
 
     Uses NSApplication.nextEventMatchingMask… + sendEvent_ to pump both
     AppKit events (menu clicks) and run-loop sources (IOBluetooth
-    callbacks) in a single loop.
+    callbacks) in a single loop. Queued BT operations run from a perform
+    block on the same run loop, so the loop only wakes for real work and
+    the periodic menu status refresh.
     """
+    from AppKit import NSApplication
     from Foundation import NSDate, NSDefaultRunLoopMode
 
+    _raise_main_thread_qos()
+
     # Menu bar icon
     delegate, status_line, connect_item = setup_menu_bar()
     ns_app = NSApplication.sharedApplication()
     log.info("Menu bar icon ready")
 
-    # Flask web server (daemon thread)
-    flask_thread = threading.Thread(target=run_flask, daemon=True)
-    flask_thread.start()
-    log.info("Flask server started on http://127.0.0.1:5050")
+    # HTTP server (daemon thread)
+    server_thread = threading.Thread(target=run_server, daemon=True)
+    server_thread.start()
+    log.info("HTTP server started on http://127.0.0.1:5050")
 
     log.info("Web UI available at http://localhost:5050")
 
-    tick = 0
     NSAnyEventMask = 0xFFFFFFFF
 
     try:
         while not _quit_requested:
             # Pump AppKit events (menus, clicks) — also runs the
-            # CFRunLoop internally, which processes IOBluetooth callbacks.
+            # CFRunLoop internally, which processes IOBluetooth callbacks
+            # and the bt_queue perform blocks from schedule_on_main().
             event = ns_app.nextEventMatchingMask_untilDate_inMode_dequeue_(
                 NSAnyEventMask,
-                NSDate.dateWithTimeIntervalSinceNow_(0.05),
+                NSDate.dateWithTimeIntervalSinceNow_(STATUS_REFRESH_INTERVAL),
                 NSDefaultRunLoopMode,
                 True,
             )
             if event is not None:
                 ns_app.sendEvent_(event)
 
-            # Execute queued BT operations from Flask / menu bar
-            while not bt_queue.empty():
-                try:
-                    fn = bt_queue.get_nowait()
-                    fn()
-                except queue.Empty:
-                    break
-                except Exception:
-                    log.exception("Error in queued BT operation")
-
-            # Update menu bar status (~once per second)
-            tick += 1
-            if tick % 20 == 0:
-                delegate.update_status(status_line, connect_item)
+            delegate.update_status(status_line, connect_item)
 
     except KeyboardInterrupt:
         log.info("Shutting down...")
@@ -0,0 +1,26 @@
+"""PyObjC framework wrappers that are imported on first use (PEP 562).
+
+Loading a framework wrapper is a large share of PyObjC start-up time, and
+IOBluetooth is only needed once the user lists devices or connects, not
+to show the menu bar or serve the web UI. Access it as
+``_frameworks.IOBluetooth``; the first access imports it.
+
+py2app cannot see these imports, so every name here must also be listed
+in the setup.py ``includes``.
+"""
+
+import importlib
+
+_LAZY_FRAMEWORKS = frozenset({"IOBluetooth"})
+
+
+def __getattr__(name):
+    if name not in _LAZY_FRAMEWORKS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(name)
+    globals()[name] = module  # later lookups skip __getattr__
+    return module
+
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_FRAMEWORKS)
@@ -8,13 +8,21 @@ Protocol details verified via live Bluetooth testing:
   - Bidirectional ACK handshake required
 """
 
+from __future__ import annotations
+
+import functools
 import logging
 import re
+import threading
 import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
 
 import objc
 
-# Fix PyObjC metadata BEFORE importing IOBluetooth classes
+# Fix PyObjC metadata BEFORE IOBluetooth classes are used (registered by
+# class name, so the framework itself need not be loaded yet)
 objc.registerMetaDataForSelector(
     b"IOBluetoothSDPServiceRecord",
     b"getRFCOMMChannelID:",
@@ -36,11 +44,12 @@ objc.registerMetaDataForSelector(
     },
 )
 
-from Foundation import NSObject, NSRunLoop, NSDate  # noqa: E402
-from IOBluetooth import (  # noqa: E402
-    IOBluetoothDevice,
-    IOBluetoothRFCOMMChannel,
-    IOBluetoothSDPUUID,
+from Foundation import (  # noqa: E402
+    NSDate,
+    NSDefaultRunLoopMode,
+    NSObject,
+    NSPredicate,
+    NSRunLoop,
 )
 
 from protocol.codec import (  # noqa: E402
@@ -50,6 +59,12 @@ from protocol.codec import (  # noqa: E402
 )
 from protocol.constants import DataType, CommandType  # noqa: E402
 
+# IOBluetooth is loaded on first use (see _frameworks)
+from . import _frameworks  # noqa: E402
+
+if TYPE_CHECKING:
+    from IOBluetooth import IOBluetoothDevice, IOBluetoothRFCOMMChannel
+
 log = logging.getLogger(__name__)
 
 # V2 UUID — works with XM4+, XM5, XM6
@@ -65,6 +80,18 @@ SERVICE_UUID_V1 = bytes([
 
 FALLBACK_RFCOMM_CHANNEL = 9
 
+# IOBluetoothSDPUUID objects for the UUIDs above, created on first use
+_SERVICE_UUIDS = None
+
+_SONY_DEVICE_PREDICATE = NSPredicate.predicateWithFormat_(
+    "name CONTAINS %@", "WH-1000XM"
+)
+
+# RFCOMM (UUID 0x0003) entry of an SDP protocol descriptor list, as printed
+# by IOBluetoothSDPDataElement; group 1 is the channel number
+_RFCOMM_MARKER = "uuid32(00 00 00 03)"
+_RFCOMM_CHANNEL_RE = re.compile(r"uuid32\(00 00 00 03\),\s*uint32\((\d+)\)")
+
 
 def _build_ack_packet(seq: int) -> bytes:
     """Build a raw ACK packet (type=0x01, no payload)."""
@@ -73,26 +100,63 @@ def _build_ack_packet(seq: int) -> bytes:
     return bytes([0x3E]) + inner + bytes([chk]) + bytes([0x3C])
 
 
-class RFCOMMDelegate(NSObject):
-    """Objective-C delegate for IOBluetoothRFCOMMChannel callbacks."""
+# Every received frame is ACKed with the other sequence number, so there
+# are only two possible ACK packets. Keyed by the received seq; anything
+# outside 0/1 is answered like seq 1 (i.e. with seq 0).
+_ACK_REPLIES = {seq: _build_ack_packet(1 - seq) for seq in (0, 1)}
+_ACK_REPLY_DEFAULT = _ACK_REPLIES[1]
 
-    def initWithConnector_(self, connector):
-        self = objc.super(RFCOMMDelegate, self).init()
-        if self is None:
-            return None
-        self.connector = connector
-        return self
 
-    def rfcommChannelData_data_length_(self, channel, data, length):
-        raw = bytes(data[:length])
-        self.connector._on_data_received(raw)
+@dataclass(frozen=True, slots=True)
+class State:
+    """Immutable snapshot of the headphone state (the /api/status fields).
 
-    def rfcommChannelClosed_(self, channel):
-        log.warning("RFCOMM channel closed by remote device")
-        self.connector._on_disconnected()
+    The connector swaps in a new instance on every change, so readers on
+    other threads can use one without locking.
+    """
+    connected: bool = False
+    battery: int = -1
+    charging: bool = False
+    anc_mode: str = "unknown"
+    volume: int = -1
+    dsee: bool = False
+    speak_to_chat: bool = False
+
+
+@functools.cache
+def _rfcomm_delegate_class():
+    """Define RFCOMMDelegate once IOBluetooth is loaded.
+
+    PyObjC takes the signatures of rfcommChannelData:data:length: and
+    rfcommChannelOpenComplete:status: from the IOBluetooth metadata when
+    the class is created; defined before the framework is imported, they
+    would fall back to all-object arguments. Cached because an
+    Objective-C class can only be registered once.
+    """
+    _frameworks.IOBluetooth  # load the delegate protocol metadata
 
-    def rfcommChannelOpenComplete_status_(self, channel, status):
-        log.info("RFCOMM channel open complete, status: %d", status)
+    class RFCOMMDelegate(NSObject):
+        """Objective-C delegate for IOBluetoothRFCOMMChannel callbacks."""
+
+        def initWithConnector_(self, connector):
+            self = objc.super(RFCOMMDelegate, self).init()
+            if self is None:
+                return None
+            self.connector = connector
+            return self
+
+        def rfcommChannelData_data_length_(self, channel, data, length):
+            raw = bytes(data[:length])
+            self.connector._on_data_received(raw)
+
+        def rfcommChannelClosed_(self, channel):
+            log.warning("RFCOMM channel closed by remote device")
+            self.connector._on_disconnected()
+
+        def rfcommChannelOpenComplete_status_(self, channel, status):
+            log.info("RFCOMM channel open complete, status: %d", status)
+
+    return RFCOMMDelegate
 
 
 class SonyBluetoothConnector:
@@ -105,40 +169,81 @@ class SonyBluetoothConnector:
         self.seq_number: int = 0
         self.device: IOBluetoothDevice | None = None
         self.channel: IOBluetoothRFCOMMChannel | None = None
-        self.delegate: RFCOMMDelegate | None = None
+        self.delegate: NSObject | None = None  # an RFCOMMDelegate
         self._recv_buffer = bytearray()
-        self._pending_responses: list[Message] = []
-        self._connected = False
+        # Received data messages by command byte, for send_command to match
+        self._pending_responses: defaultdict[int, deque[Message]] = defaultdict(deque)
+
+        # Cached state, replaced (never mutated) on change
+        self._state = State()
+        # Notified whenever the state changes
+        self.state_changed = threading.Condition()
+        self.state_version: int = 0
+
+        # Notification handlers keyed by command byte (plain ints, so the
+        # lookup never goes through IntEnum.__eq__)
+        self._notify_handlers = {
+            int(CommandType.BATTERY_RET): self._handle_battery,
+            int(CommandType.NC_ASM_RET): self._handle_anc,
+            int(CommandType.NC_ASM_NOTIFY): self._handle_anc,
+            int(CommandType.PLAY_RET_PARAM): self._handle_volume,
+            0xA9: self._handle_volume,
+            int(CommandType.DSEE_RET): self._handle_dsee,
+            int(CommandType.DSEE_NOTIFY): self._handle_dsee,
+            int(CommandType.SPEAK_TO_CHAT_RET): self._handle_speak_to_chat,
+            int(CommandType.SPEAK_TO_CHAT_NOTIFY): self._handle_speak_to_chat,
+        }
 
-        # Cached state
-        self.battery_level: int = -1
-        self.battery_charging: bool = False
-        self.anc_mode: str = "unknown"
-        self.volume_level: int = -1
-        self.dsee_enabled: bool = False
-        self.speak_to_chat_enabled: bool = False
+    @property
+    def state(self) -> State:
+        """Current state snapshot. Safe to read from any thread."""
+        return self._state
 
     @property
     def connected(self) -> bool:
-        return self._connected
+        return self._state.connected
+
+    def wait_for_state_change(self, version: int, timeout: float | None = None) -> int:
+        """Block until state_version differs from version; return the new one.
+
+        Safe to call from any thread. Returns version unchanged on timeout.
+        """
+        with self.state_changed:
+            self.state_changed.wait_for(
+                lambda: self.state_version != version, timeout
+            )
+            return self.state_version
+
+    def _set_state(self, **fields):
+        """Publish a new State with fields replaced, if anything changed."""
+        state = replace(self._state, **fields)
+        if state == self._state:
+            return
+        with self.state_changed:
+            self._state = state
+            self.state_version += 1
+            self.state_changed.notify_all()
 
     def discover_sony_devices(self) -> list[dict]:
-        devices = IOBluetoothDevice.pairedDevices()
+        devices = _frameworks.IOBluetooth.IOBluetoothDevice.pairedDevices()
         if not devices:
             return []
-        results = []
-        for dev in devices:
-            name = dev.name()
-            if name and "WH-1000XM" in name:
-                results.append({
-                    "name": str(name),
-                    "address": str(dev.addressString()),
-                })
-        return results
+        # Filter in Cocoa so only matching devices cross the bridge
+        matched = devices.filteredArrayUsingPredicate_(_SONY_DEVICE_PREDICATE)
+        return [
+            {"name": str(dev.name()), "address": str(dev.addressString())}
+            for dev in matched
+        ]
 
     def _find_rfcomm_channel(self) -> int | None:
-        for uuid_bytes in (SERVICE_UUID_V2, SERVICE_UUID_V1):
-            uuid_obj = IOBluetoothSDPUUID.uuidWithBytes_length_(uuid_bytes, 16)
+        global _SERVICE_UUIDS
+        if _SERVICE_UUIDS is None:
+            sdp_uuid = _frameworks.IOBluetooth.IOBluetoothSDPUUID
+            _SERVICE_UUIDS = tuple(
+                sdp_uuid.uuidWithBytes_length_(uuid_bytes, 16)
+                for uuid_bytes in (SERVICE_UUID_V2, SERVICE_UUID_V1)
+            )
+        for uuid_obj in _SERVICE_UUIDS:
             record = self.device.getServiceRecordForUUID_(uuid_obj)
             if record is not None:
                 io_ret, channel_id = record.getRFCOMMChannelID_(None)
@@ -151,15 +256,16 @@ class SonyBluetoothConnector:
         if records:
             for rec in records:
                 proto = rec.getAttributeDataElement_(0x0004)
-                svc_class = rec.getAttributeDataElement_(0x0001)
-                if proto is None or svc_class is None:
+                if proto is None:
                     continue
                 proto_str = str(proto)
-                svc_str = str(svc_class)
-                if "uuid128" in svc_str and "uuid32(00 00 00 03)" in proto_str:
-                    m = re.search(
-                        r"uuid32\(00 00 00 03\),\s*uint32\((\d+)\)", proto_str
-                    )
+                # Cheap substring test first; only RFCOMM records need the
+                # service class lookup and the regex
+                if _RFCOMM_MARKER not in proto_str:
+                    continue
+                svc_class = rec.getAttributeDataElement_(0x0001)
+                if svc_class is not None and "uuid128" in str(svc_class):
+                    m = _RFCOMM_CHANNEL_RE.search(proto_str)
                     if m:
                         channel_id = int(m.group(1))
                         log.info("Found RFCOMM channel %d via SDP scan", channel_id)
@@ -169,7 +275,7 @@ class SonyBluetoothConnector:
         return FALLBACK_RFCOMM_CHANNEL
 
     def connect(self, address: str) -> bool:
-        if self._connected:
+        if self._state.connected:
             return True
 
         # Clean up any leftover state from previous connection
@@ -188,7 +294,9 @@ class SonyBluetoothConnector:
         self.delegate = None
 
         log.info("Connecting to %s ...", address)
-        self.device = IOBluetoothDevice.deviceWithAddressString_(address)
+        self.device = _frameworks.IOBluetooth.IOBluetoothDevice.deviceWithAddressString_(
+            address
+        )
         if self.device is None:
             log.error("Device not found: %s", address)
             return False
@@ -198,17 +306,16 @@ class SonyBluetoothConnector:
             log.error("SDP query failed: %d", result)
             return False
 
-        for _ in range(30):
-            NSRunLoop.currentRunLoop().runUntilDate_(
-                NSDate.dateWithTimeIntervalSinceNow_(0.1)
-            )
+        # Let the SDP query settle; one 3s run instead of 30 short slices
+        run_loop = NSRunLoop.currentRunLoop()
+        run_loop.runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(3.0))
 
         channel_id = self._find_rfcomm_channel()
         if channel_id is None:
             log.error("Could not determine RFCOMM channel")
             return False
 
-        self.delegate = RFCOMMDelegate.alloc().initWithConnector_(self)
+        self.delegate = _rfcomm_delegate_class().alloc().initWithConnector_(self)
         result, self.channel = self.device.openRFCOMMChannelAsync_withChannelID_delegate_(
             None, channel_id, self.delegate
         )
@@ -216,10 +323,10 @@ class SonyBluetoothConnector:
             log.error("Failed to open RFCOMM channel %d: %d", channel_id, result)
             return False
 
+        run_until = run_loop.runUntilDate_
+        date_in = NSDate.dateWithTimeIntervalSinceNow_
         for _ in range(50):
-            NSRunLoop.currentRunLoop().runUntilDate_(
-                NSDate.dateWithTimeIntervalSinceNow_(0.1)
-            )
+            run_until(date_in(0.1))
             if self.channel and self.channel.isOpen():
                 break
 
@@ -227,16 +334,13 @@ class SonyBluetoothConnector:
             log.error("RFCOMM channel did not open in time")
             return False
 
-        self._connected = True
+        self._set_state(connected=True)
         self.seq_number = 0
         self._recv_buffer.clear()
         self._pending_responses.clear()
 
         # Drain initial notifications
-        for _ in range(20):
-            NSRunLoop.currentRunLoop().runUntilDate_(
-                NSDate.dateWithTimeIntervalSinceNow_(0.05)
-            )
+        run_until(date_in(1.0))
         self._pending_responses.clear()
 
         # Protocol initialization handshake
@@ -258,7 +362,7 @@ class SonyBluetoothConnector:
         if self.device:
             self.device.closeConnection()
             self.device = None
-        self._connected = False
+        self._set_state(connected=False)
         self.delegate = None
         self._recv_buffer.clear()
         self._pending_responses.clear()
@@ -268,9 +372,10 @@ class SonyBluetoothConnector:
         """Send a command and wait for the matching response.
 
         Uses DataMdr (0x0C) for XM6. Polls NSRunLoop for delegate callbacks.
-        Filters responses by expected command byte.
+        Filters responses by expected command byte. A timeout <= 0 only
+        writes the packet and returns None without waiting.
         """
-        if not self._connected or not self.channel:
+        if not self._state.connected or not self.channel:
             return None
 
         seq = self.seq_number
@@ -279,22 +384,32 @@ class SonyBluetoothConnector:
         self._pending_responses.clear()
 
         request_cmd = payload[0]
-        expected_cmds = {request_cmd, (request_cmd + 1) & 0xFF}
+        expected_cmds = (request_cmd, (request_cmd + 1) & 0xFF)
 
         log.info("TX [seq=%d cmd=0x%02X]", seq, request_cmd)
         result = self.channel.writeSync_length_(packet, len(packet))
         if result != 0:
             log.error("RFCOMM write failed: %d", result)
             return None
+        if timeout <= 0:
+            return None
 
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
-            NSRunLoop.currentRunLoop().runUntilDate_(
-                NSDate.dateWithTimeIntervalSinceNow_(0.05)
-            )
-            for i, resp in enumerate(self._pending_responses):
-                if resp.payload and resp.payload[0] in expected_cmds:
-                    self._pending_responses.pop(i)
+        # Bound once: each attribute hop on an ObjC object is a bridge call
+        run_mode = NSRunLoop.currentRunLoop().runMode_beforeDate_
+        date_in = NSDate.dateWithTimeIntervalSinceNow_
+        pending = self._pending_responses
+        monotonic = time.monotonic
+
+        deadline = monotonic() + timeout
+        while monotonic() < deadline:
+            # runMode:beforeDate: returns once the RFCOMM data callback has
+            # fired, so a response is picked up as soon as it arrives rather
+            # than at the end of a fixed 50ms slice.
+            run_mode(NSDefaultRunLoopMode, date_in(0.05))
+            for cmd in expected_cmds:
+                responses = pending.get(cmd)
+                if responses:
+                    resp = responses.popleft()
                     log.info(
                         "RX [cmd=0x%02X]: %s",
                         resp.payload[0], resp.payload.hex(),
@@ -305,82 +420,100 @@ class SonyBluetoothConnector:
         return None
 
     def _on_data_received(self, data: bytes):
-        self._recv_buffer.extend(data)
-
+        if self._recv_buffer:
+            # A frame straddles callbacks: append and parse the joined bytes
+            self._recv_buffer += data
+            buffer = self._recv_buffer
+        else:
+            # Usual case: the chunk holds whole frames, parse it where it is
+            # and only buffer a trailing partial frame
+            buffer = data
+
+        # Walk the buffer by offset and drop the consumed prefix once,
+        # in place, after all complete frames have been handled
+        pos = 0
+        # ACKs for every frame in this chunk, sent as a single write (RFCOMM
+        # is a byte stream, so the device cannot tell the difference)
+        acks = bytearray()
         while True:
-            msg, remaining = extract_message(bytes(self._recv_buffer))
-            self._recv_buffer = bytearray(remaining)
+            msg, pos = extract_message(buffer, pos)
             if msg is None:
                 break
 
             if msg.data_type == DataType.ACK:
                 # ACK from device — send bidirectional ACK back and update seq
-                next_seq = 1 - msg.seq if msg.seq <= 1 else 0
-                ack = _build_ack_packet(next_seq)
-                if self.channel:
-                    self.channel.writeSync_length_(ack, len(ack))
+                acks += _ACK_REPLIES.get(msg.seq, _ACK_REPLY_DEFAULT)
                 self.seq_number = msg.seq
                 log.debug("ACK seq=%d, next_cmd_seq=%d", msg.seq, msg.seq)
             else:
                 # Data packet — ACK it and queue for processing
-                next_seq = 1 - msg.seq if msg.seq <= 1 else 0
-                ack = _build_ack_packet(next_seq)
-                if self.channel:
-                    self.channel.writeSync_length_(ack, len(ack))
+                acks += _ACK_REPLIES.get(msg.seq, _ACK_REPLY_DEFAULT)
 
                 self._process_notification(msg)
-                self._pending_responses.append(msg)
+                if msg.payload:
+                    self._pending_responses[msg.payload[0]].append(msg)
+
+        if buffer is data:
+            self._recv_buffer += memoryview(data)[pos:]
+        else:
+            del self._recv_buffer[:pos]
+        if acks and self.channel:
+            self.channel.writeSync_length_(bytes(acks), len(acks))
 
     def _process_notification(self, msg: Message):
         if not msg.payload:
             return
 
-        cmd = msg.payload[0]
-
-        if cmd in (CommandType.BATTERY_RET,):
-            # 0x23: payload[2]=level, payload[3]=charging
-            if len(msg.payload) >= 4:
-                self.battery_level = msg.payload[2]
-                self.battery_charging = bool(msg.payload[3])
-                log.info("Battery: %d%%, charging=%s", self.battery_level, self.battery_charging)
-
-        elif cmd in (CommandType.NC_ASM_RET, CommandType.NC_ASM_NOTIFY):
-            # 0x67/0x69: XM6 response format verified from HCI:
-            #   NC ON:  69 19 01 [01] [00] [00] 14 00 00  (enable=1, asm=0)
-            #   ASM ON: 69 19 01 [01] [01] [00] 0f 00 00  (enable=1, asm=1)
-            #   OFF:    69 19 01 [00] [00] [00] 14 00 00  (enable=0)
-            # NC is inferred: enable=1 and asm=0 means NC mode
-            if len(msg.payload) >= 5:
-                enable = bool(msg.payload[3])
-                asm_on = bool(msg.payload[4])
-                if enable and not asm_on:
-                    self.anc_mode = "nc"
-                elif enable and asm_on:
-                    self.anc_mode = "ambient"
-                else:
-                    self.anc_mode = "off"
-                log.info("ANC: %s", self.anc_mode)
-
-        elif cmd in (CommandType.PLAY_RET_PARAM, 0xA9):
-            # 0xA7/0xA9: payload[2]=volume
-            if len(msg.payload) >= 3:
-                self.volume_level = msg.payload[2]
-                log.info("Volume: %d", self.volume_level)
-
-        elif cmd in (CommandType.DSEE_RET, CommandType.DSEE_NOTIFY):
-            # 0xE7/0xE9: payload[2]=enabled
-            if len(msg.payload) >= 3:
-                self.dsee_enabled = bool(msg.payload[2])
-                log.info("DSEE: %s", self.dsee_enabled)
-
-        elif cmd in (CommandType.SPEAK_TO_CHAT_RET, CommandType.SPEAK_TO_CHAT_NOTIFY):
-            # 0xF7/0xF9: payload[2]=enabled
-            if len(msg.payload) >= 3:
-                self.speak_to_chat_enabled = bool(msg.payload[2])
-                log.info("Speak-to-Chat: %s", self.speak_to_chat_enabled)
+        handler = self._notify_handlers.get(msg.payload[0])
+        if handler is not None:
+            handler(msg.payload)
+
+    def _handle_battery(self, payload: bytes):
+        # 0x23: payload[2]=level, payload[3]=charging
+        if len(payload) >= 4:
+            self._set_state(
+                battery=payload[2],
+                charging=bool(payload[3]),
+            )
+            log.info("Battery: %d%%, charging=%s", self._state.battery, self._state.charging)
+
+    def _handle_anc(self, payload: bytes):
+        # 0x67/0x69: XM6 response format verified from HCI:
+        #   NC ON:  69 19 01 [01] [00] [00] 14 00 00  (enable=1, asm=0)
+        #   ASM ON: 69 19 01 [01] [01] [00] 0f 00 00  (enable=1, asm=1)
+        #   OFF:    69 19 01 [00] [00] [00] 14 00 00  (enable=0)
+        # NC is inferred: enable=1 and asm=0 means NC mode
+        if len(payload) >= 5:
+            enable = bool(payload[3])
+            asm_on = bool(payload[4])
+            if enable and not asm_on:
+                self._set_state(anc_mode="nc")
+            elif enable and asm_on:
+                self._set_state(anc_mode="ambient")
+            else:
+                self._set_state(anc_mode="off")
+            log.info("ANC: %s", self._state.anc_mode)
+
+    def _handle_volume(self, payload: bytes):
+        # 0xA7/0xA9: payload[2]=volume
+        if len(payload) >= 3:
+            self._set_state(volume=payload[2])
+            log.info("Volume: %d", self._state.volume)
+
+    def _handle_dsee(self, payload: bytes):
+        # 0xE7/0xE9: payload[2]=enabled
+        if len(payload) >= 3:
+            self._set_state(dsee=bool(payload[2]))
+            log.info("DSEE: %s", self._state.dsee)
+
+    def _handle_speak_to_chat(self, payload: bytes):
+        # 0xF7/0xF9: payload[2]=enabled
+        if len(payload) >= 3:
+            self._set_state(speak_to_chat=bool(payload[2]))
+            log.info("Speak-to-Chat: %s", self._state.speak_to_chat)
 
     def _on_disconnected(self):
-        self._connected = False
+        self._set_state(connected=False)
         self.channel = None
         self.device = None
         self.delegate = None
@@ -0,0 +1,161 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled versions of the per-packet codec functions.
+
+Optional: protocol.codec imports pack/unpack/extract_message from here
+when the extension has been built (see setup.py) and keeps its pure
+Python implementations otherwise. Results must match codec.py for all
+valid inputs.
+"""
+
+from cpython.bytearray cimport PyByteArray_AS_STRING
+from cpython.bytes cimport PyBytes_FromStringAndSize
+
+from .codec import Message
+from .constants import UNESCAPE_TABLE
+
+cdef enum:
+    START = 0x3E
+    END = 0x3C
+    ESC = 0x3D
+    # Escaped bytes are sent as ESC, byte - ESC_OFFSET (0x3C -> 0x2C, ...)
+    ESC_OFFSET = 0x10
+    # Frames up to this size are built/decoded in a stack buffer; only
+    # larger ones allocate a scratch bytearray
+    STACK_BUF = 512
+
+# Byte after ESC -> original byte, 0 if it is not a valid escape code
+cdef unsigned char _unescape[256]
+for _i in range(256):
+    _unescape[_i] = UNESCAPE_TABLE[_i]
+
+
+cdef inline Py_ssize_t _put(unsigned char *out, Py_ssize_t j, unsigned char c):
+    """Write c at out[j], escaped if needed; return the next index."""
+    if c == END or c == ESC or c == START:
+        out[j] = ESC
+        out[j + 1] = c - ESC_OFFSET
+        return j + 2
+    out[j] = c
+    return j + 1
+
+
+def pack(int data_type, int seq, const unsigned char[:] payload):
+    """Build a complete framed packet ready to send over RFCOMM."""
+    cdef Py_ssize_t n = payload.shape[0]
+    cdef Py_ssize_t i, j = 0
+    cdef unsigned int chk = 0
+    cdef unsigned char header[6]
+    cdef unsigned char c
+    cdef unsigned char stack[STACK_BUF]
+    cdef unsigned char *out = stack
+
+    # Worst case every inner byte is escaped, plus the two markers
+    cdef Py_ssize_t size = 2 * (6 + n + 1) + 2
+    if size > STACK_BUF:
+        buf = bytearray(size)
+        out = <unsigned char *>PyByteArray_AS_STRING(buf)
+
+    header[0] = <unsigned char>data_type
+    header[1] = <unsigned char>seq
+    header[2] = (n >> 24) & 0xFF
+    header[3] = (n >> 16) & 0xFF
+    header[4] = (n >> 8) & 0xFF
+    header[5] = n & 0xFF
+
+    out[j] = START
+    j += 1
+    for i in range(6):
+        c = header[i]
+        chk += c
+        j = _put(out, j, c)
+    for i in range(n):
+        c = payload[i]
+        chk += c
+        j = _put(out, j, c)
+    j = _put(out, j, chk & 0xFF)
+    out[j] = END
+    j += 1
+    return PyBytes_FromStringAndSize(<char *>out, j)
+
+
+def unpack(raw):
+    """Decode a raw framed packet into a Message (None if malformed)."""
+    cdef const unsigned char[:] view = raw
+    cdef Py_ssize_t n = view.shape[0]
+    cdef Py_ssize_t i, k = 0
+    cdef unsigned int chk = 0
+    cdef unsigned char c, orig
+    cdef unsigned long length
+
+    if n < 2 or view[0] != START or view[n - 1] != END:
+        return None
+
+    cdef unsigned char stack[STACK_BUF]
+    cdef unsigned char *inner = stack
+    if n > STACK_BUF:
+        buf = bytearray(n)
+        inner = <unsigned char *>PyByteArray_AS_STRING(buf)
+    i = 1
+    while i < n - 1:
+        c = view[i]
+        if c == ESC and i + 1 < n - 1:
+            orig = _unescape[view[i + 1]]
+            if orig:
+                inner[k] = orig
+                k += 1
+                i += 2
+                continue
+        inner[k] = c
+        k += 1
+        i += 1
+
+    if k < 7:  # header(6) + checksum(1) minimum
+        return None
+
+    for i in range(k - 1):
+        chk += inner[i]
+    if inner[k - 1] != (chk & 0xFF):
+        return None
+
+    length = (
+        (<unsigned long>inner[2] << 24) | (<unsigned long>inner[3] << 16)
+        | (<unsigned long>inner[4] << 8) | inner[5]
+    )
+    # Same bound as slicing inner[6:6 + length] in the Python version
+    if length > <unsigned long>(k - 6):
+        return None
+    return Message(
+        data_type=inner[0],
+        seq=inner[1],
+        payload=PyBytes_FromStringAndSize(<char *>inner + 6, length),
+    )
+
+
+def extract_message(buffer, Py_ssize_t start_from=0):
+    """Extract the first complete packet at or after start_from.
+
+    Returns (message, index of the first unconsumed byte); with no
+    complete packet, index is the start of a trailing partial packet or
+    len(buffer).
+    """
+    cdef const unsigned char[:] view = buffer
+    cdef Py_ssize_t n = view.shape[0]
+    cdef Py_ssize_t pos = start_from, start, end
+
+    while True:
+        start = pos
+        while start < n and view[start] != START:
+            start += 1
+        if start >= n:
+            return None, n
+        end = start + 1
+        while end < n and view[end] != END:
+            end += 1
+        if end >= n:
+            return None, start  # keep from start marker onward
+
+        msg = unpack(view[start:end + 1])
+        if msg is not None:
+            return msg, end + 1
+        # Malformed — skip this start marker and try again
+        pos = start + 1
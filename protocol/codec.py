@@ -6,6 +6,8 @@ Packet structure:
 All bytes between START and END are escaped.
 """
 
+import re
+import struct
 from dataclasses import dataclass
 
 from .constants import (
@@ -17,8 +19,25 @@ from .constants import (
     DataType,
 )
 
+# Escaping runs in C: one regex pass finds the special bytes, and
+# unescaping is a fixed sequence of bytes.replace() calls. Both first check
+# whether there is anything to do at all, which is rarely the case.
+_ESCAPE_BYTES = bytes(sorted(ESCAPE_MAP))
+_ESCAPE_PATTERN = re.compile(
+    b"[" + re.escape(_ESCAPE_BYTES) + b"]"
+)
+_ESCAPE_REPL = {
+    bytes([b]): bytes([ESCAPE_BYTE, code]) for b, code in ESCAPE_MAP.items()
+}
+# The ESCAPE_BYTE pair must be replaced last: it yields ESCAPE_BYTE, which
+# could otherwise pair up with a following code byte.
+_UNESCAPE_PAIRS = tuple(
+    (bytes([ESCAPE_BYTE, code]), bytes([b]))
+    for code, b in sorted(UNESCAPE_MAP.items(), key=lambda kv: kv[1] == ESCAPE_BYTE)
+)
+
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """A decoded protocol message."""
     data_type: int
@@ -28,37 +47,36 @@ class Message:
 
 def escape(data: bytes) -> bytes:
     """Escape special bytes in the payload region."""
-    out = bytearray()
-    for b in data:
-        if b in ESCAPE_MAP:
-            out.append(ESCAPE_BYTE)
-            out.append(ESCAPE_MAP[b])
-        else:
-            out.append(b)
-    return bytes(out)
+    # translate() deleting the special bytes is a single C pass and beats
+    # a regex search for the (common) nothing-to-escape case
+    if len(data.translate(None, _ESCAPE_BYTES)) == len(data):
+        return bytes(data)
+    return _ESCAPE_PATTERN.sub(lambda m: _ESCAPE_REPL[m.group()], data)
 
 
 def unescape(data: bytes) -> bytes:
     """Reverse escaping of special bytes."""
-    out = bytearray()
-    i = 0
-    while i < len(data):
-        if data[i] == ESCAPE_BYTE and i + 1 < len(data):
-            next_byte = data[i + 1]
-            if next_byte in UNESCAPE_MAP:
-                out.append(UNESCAPE_MAP[next_byte])
-                i += 2
-                continue
-        out.append(data[i])
-        i += 1
-    return bytes(out)
+    data = bytes(data)
+    if ESCAPE_BYTE not in data:
+        return data
+    for pair, original in _UNESCAPE_PAIRS:
+        data = data.replace(pair, original)
+    return data
 
 
 def checksum(data: bytes) -> int:
-    """Wrapping sum of all bytes, truncated to uint8."""
+    """Wrapping sum of all bytes, truncated to uint8.
+
+    sum() over a bytes-like object already iterates in C without
+    allocating, which is the fastest option for frames of this size.
+    """
     return sum(data) & 0xFF
 
 
+# data_type, seq, 4-byte big-endian payload length
+_HEADER = struct.Struct(">BBI")
+
+
 def pack(data_type: int, seq: int, payload: bytes) -> bytes:
     """Build a complete framed packet ready to send over RFCOMM.
 
@@ -66,20 +84,22 @@ def pack(data_type: int, seq: int, payload: bytes) -> bytes:
         START | data_type | seq | len_hi | len_mid_hi | len_mid_lo | len_lo | payload | checksum | END
     """
     length = len(payload)
-    # Header: data_type, seq, 4-byte big-endian length
-    header = bytes([
-        data_type,
-        seq,
-        (length >> 24) & 0xFF,
-        (length >> 16) & 0xFF,
-        (length >> 8) & 0xFF,
-        length & 0xFF,
-    ])
-    inner = header + payload
-    chk = checksum(inner)
-    inner_with_chk = inner + bytes([chk])
-    escaped = escape(inner_with_chk)
-    return bytes([START_MARKER]) + escaped + bytes([END_MARKER])
+    # Lay the whole frame out in one buffer: markers, header, payload and
+    # checksum are written in place, and only the inner region is escaped
+    # (almost never needed for command frames).
+    frame = bytearray(length + 9)
+    frame[0] = START_MARKER
+    _HEADER.pack_into(frame, 1, data_type, seq, length)
+    frame[7:7 + length] = payload
+    # Checksum and END slots are still zero, so this sums exactly the
+    # header and payload
+    frame[-2] = (sum(frame) - START_MARKER) & 0xFF
+    frame[-1] = END_MARKER
+    # The two markers are the only special bytes unless the inner region
+    # needs escaping
+    if len(frame.translate(None, _ESCAPE_BYTES)) != len(frame) - 2:
+        frame[1:-1] = escape(frame[1:-1])
+    return bytes(frame)
 
 
 def unpack(raw: bytes) -> Message | None:
@@ -95,15 +115,14 @@ def unpack(raw: bytes) -> Message | None:
     if len(inner) < 7:  # header(6) + checksum(1) minimum
         return None
 
-    # Verify checksum
+    # Verify checksum (sum over the whole frame minus the checksum byte,
+    # avoiding a copy of everything but the last byte)
     expected_chk = inner[-1]
-    actual_chk = checksum(inner[:-1])
+    actual_chk = (sum(inner) - expected_chk) & 0xFF
     if expected_chk != actual_chk:
         return None
 
-    data_type = inner[0]
-    seq = inner[1]
-    length = (inner[2] << 24) | (inner[3] << 16) | (inner[4] << 8) | inner[5]
+    data_type, seq, length = _HEADER.unpack_from(inner)
     payload = inner[6:6 + length]
 
     if len(payload) != length:
@@ -112,27 +131,34 @@ def unpack(raw: bytes) -> Message | None:
     return Message(data_type=data_type, seq=seq, payload=payload)
 
 
-def extract_message(buffer: bytes) -> tuple[Message | None, bytes]:
-    """Extract the first complete packet from a byte buffer.
+def extract_message(
+    buffer: bytes | bytearray, start_from: int = 0
+) -> tuple[Message | None, int]:
+    """Extract the first complete packet at or after start_from.
 
-    Returns (message, remaining_buffer). If no complete packet is found,
-    returns (None, buffer).
+    Returns (message, index), where index is the offset of the first byte
+    not yet consumed. If no complete packet is found, returns (None, index)
+    with index at the start of a trailing partial packet, or len(buffer)
+    if there is none (bytes without a start marker can never become a
+    packet), so the caller can drop everything before it. The buffer is
+    never copied.
     """
-    start = buffer.find(START_MARKER)
-    if start == -1:
-        return None, buffer
+    pos = start_from
+    with memoryview(buffer) as view:
+        while True:
+            start = buffer.find(START_MARKER, pos)
+            if start == -1:
+                return None, len(buffer)
 
-    end = buffer.find(END_MARKER, start + 1)
-    if end == -1:
-        return None, buffer[start:]  # keep from start marker onward
+            end = buffer.find(END_MARKER, start + 1)
+            if end == -1:
+                return None, start  # keep from start marker onward
 
-    raw = buffer[start:end + 1]
-    remaining = buffer[end + 1:]
-    msg = unpack(raw)
-    if msg is None:
-        # Malformed — skip this start marker and try again
-        return extract_message(buffer[start + 1:])
-    return msg, remaining
+            msg = unpack(view[start:end + 1])
+            if msg is not None:
+                return msg, end + 1
+            # Malformed — skip this start marker and try again
+            pos = start + 1
 
 
 def build_ack(data_type: int, seq: int) -> bytes:
@@ -144,3 +170,10 @@ def build_ack(data_type: int, seq: int) -> bytes:
     }
     ack_type = ack_type_map.get(data_type, DataType.ACK)
     return pack(ack_type, seq, b"")
+
+
+# Prefer the compiled implementations when the optional extension is built
+try:
+    from ._codec import extract_message, pack, unpack  # noqa: F401,F811
+except ImportError:
+    pass
@@ -1,8 +1,11 @@
 """Sony WH-1000XM6 command builders — verified via live Bluetooth testing.
 
 Each function returns a payload (bytes) to be wrapped with codec.pack().
+Payloads that take no arguments are built once at import and shared.
 """
 
+from functools import lru_cache
+
 from .constants import (
     AncMode,
     CommandType,
@@ -60,20 +63,27 @@ def build_anc_command_xm6(
         return build_nc_asm_xm6(nc_on=False, asm_on=False)
 
 
+_NC_ASM_GET = bytes([CommandType.NC_ASM_GET, NcAsmInquiredType.XM6])
+
+
 def build_nc_asm_get() -> bytes:
     """Request current NC/ASM status. Response: cmd=0x67."""
-    return bytes([CommandType.NC_ASM_GET, NcAsmInquiredType.XM6])
+    return _NC_ASM_GET
 
 
 # --- Battery ---
 
+_BATTERY_INQUIRY = bytes([CommandType.BATTERY_GET, 0x00])
+
+
 def build_battery_inquiry() -> bytes:
     """Request battery level. Response: cmd=0x23, payload[2]=level, payload[3]=charging."""
-    return bytes([CommandType.BATTERY_GET, 0x00])
+    return _BATTERY_INQUIRY
 
 
 # --- Equalizer ---
 
+@lru_cache(maxsize=32)
 def build_eq_preset(preset: EqPreset) -> bytes:
     """Set EQ to a built-in preset."""
     return bytes([CommandType.EQ_SET, 0x01, int(preset)])
@@ -90,9 +100,12 @@ def build_volume_set(level: int) -> bytes:
     ])
 
 
+_VOLUME_GET = bytes([CommandType.PLAY_GET_PARAM, PlayInquiredType.MUSIC_VOLUME])
+
+
 def build_volume_get() -> bytes:
     """Request current volume. Response: cmd=0xA7, payload[2]=level."""
-    return bytes([CommandType.PLAY_GET_PARAM, PlayInquiredType.MUSIC_VOLUME])
+    return _VOLUME_GET
 
 
 # --- DSEE (upscaling) ---
@@ -102,9 +115,12 @@ def build_dsee_set(enabled: bool) -> bytes:
     return bytes([CommandType.DSEE_SET, 0x01, int(enabled)])
 
 
+_DSEE_GET = bytes([CommandType.DSEE_GET, 0x01])
+
+
 def build_dsee_get() -> bytes:
     """Request current DSEE state. Response: cmd=0xE7, payload[2]=enabled."""
-    return bytes([CommandType.DSEE_GET, 0x01])
+    return _DSEE_GET
 
 
 # --- Speak-to-Chat ---
@@ -120,33 +136,42 @@ def build_speak_to_chat_set(enabled: bool) -> bytes:
     ])
 
 
+_SPEAK_TO_CHAT_GET = bytes([CommandType.SPEAK_TO_CHAT_GET, 0x02])
+
+
 def build_speak_to_chat_get() -> bytes:
     """Request Speak-to-Chat state. Response: cmd=0xF7."""
-    return bytes([CommandType.SPEAK_TO_CHAT_GET, 0x02])
+    return _SPEAK_TO_CHAT_GET
 
 
 # --- Playback ---
 
-def build_playback_control(control: PlaybackControl) -> bytes:
-    """Send a playback control command."""
-    return bytes([
+_PLAYBACK_CMDS = {
+    control: bytes([
         CommandType.PLAY_SET_STATUS,
         PlayInquiredType.PLAYBACK_CONTROL,
         int(control),
     ])
+    for control in PlaybackControl
+}
+
+
+def build_playback_control(control: PlaybackControl) -> bytes:
+    """Send a playback control command."""
+    return _PLAYBACK_CMDS[control]
 
 
 def build_play() -> bytes:
-    return build_playback_control(PlaybackControl.PLAY)
+    return _PLAYBACK_CMDS[PlaybackControl.PLAY]
 
 
 def build_pause() -> bytes:
-    return build_playback_control(PlaybackControl.PAUSE)
+    return _PLAYBACK_CMDS[PlaybackControl.PAUSE]
 
 
 def build_next() -> bytes:
-    return build_playback_control(PlaybackControl.TRACK_UP)
+    return _PLAYBACK_CMDS[PlaybackControl.TRACK_UP]
 
 
 def build_prev() -> bytes:
-    return build_playback_control(PlaybackControl.TRACK_DOWN)
+    return _PLAYBACK_CMDS[PlaybackControl.TRACK_DOWN]
@@ -17,6 +17,11 @@ ESCAPE_MAP = {
 # Reverse map for unescaping
 UNESCAPE_MAP = {v: k for k, v in ESCAPE_MAP.items()}
 
+# The same as a 256-entry table indexed by the byte after ESCAPE_BYTE:
+# the original byte for a valid escape code, 0 (never a valid result)
+# otherwise
+UNESCAPE_TABLE = bytes(UNESCAPE_MAP.get(b, 0) for b in range(256))
+
 
 class DataType(IntEnum):
     """Packet data types."""
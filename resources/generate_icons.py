@@ -8,6 +8,7 @@ import os
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     from PIL import Image, ImageDraw
@@ -56,12 +57,13 @@ def draw_headphone(draw, size, color="black", line_width=None):
 
 
 def generate_menu_icon():
-    """Create 22x22 (+ @2x) template icon for the macOS menu bar.
+    """Create the template icon for the macOS menu bar.
 
     Template images are black on transparent — macOS adapts them to the
-    current menu bar appearance (light/dark mode) automatically.
+    current menu bar appearance (light/dark mode) automatically. Only the
+    44x44 (@2x) image is written; the app shows it at 22x22 points, and
+    AppKit downsamples it on non-Retina displays.
     """
-    # Draw at 2x for crisp Retina rendering
     size_2x = (44, 44)
     img = Image.new("RGBA", size_2x, (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
@@ -71,12 +73,6 @@ def generate_menu_icon():
     img.save(path_2x)
     print(f"  {path_2x}")
 
-    # 1x version (downscaled)
-    img_1x = img.resize((22, 22), Image.LANCZOS)
-    path_1x = os.path.join(RESOURCES_DIR, "icon.png")
-    img_1x.save(path_1x)
-    print(f"  {path_1x}")
-
 
 def render_app_icon(px):
     """Render a single app icon frame at the given pixel size."""
@@ -97,6 +93,13 @@ def render_app_icon(px):
     return img
 
 
+def _render_app_icon_files(px, paths):
+    """Render one app icon size and save it under each of the given paths."""
+    img = render_app_icon(px)
+    for path in paths:
+        img.save(path)
+
+
 def generate_app_icon():
     """Create AppIcon.icns via macOS iconutil."""
     # iconset requires specific filenames at specific pixel sizes
@@ -117,8 +120,13 @@ def generate_app_icon():
         iconset = os.path.join(tmpdir, "AppIcon.iconset")
         os.makedirs(iconset)
 
+        # Several entries share a pixel size; render each size once, and
+        # render the sizes in parallel (the 1024px frame dominates)
+        by_size = {}
         for fname, px in entries.items():
-            render_app_icon(px).save(os.path.join(iconset, fname))
+            by_size.setdefault(px, []).append(os.path.join(iconset, fname))
+        with ProcessPoolExecutor() as pool:
+            list(pool.map(_render_app_icon_files, by_size, by_size.values()))
 
         output = os.path.join(RESOURCES_DIR, "AppIcon.icns")
         subprocess.run(
@@ -0,0 +1,222 @@
+"""Minimal HTTP server for the localhost web UI (stdlib only).
+
+The UI needs a handful of JSON endpoints, three static files and one
+Server-Sent Events stream, so a small router on top of
+http.server.ThreadingHTTPServer replaces Flask/werkzeug/waitress.
+
+Views are plain functions registered with App.route(); they receive the
+Request plus any <name> path segments as keyword arguments and return a
+Response. Each connection is handled on its own daemon thread.
+"""
+
+import logging
+import re
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+log = logging.getLogger(__name__)
+
+
+class Request:
+    """An incoming HTTP request."""
+
+    __slots__ = ("method", "path", "headers", "body")
+
+    def __init__(self, method: str, path: str, headers, body: bytes):
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+
+class Response:
+    """An HTTP response.
+
+    body is bytes/str, or an iterable of bytes/str chunks to stream
+    (written as they are produced; the connection is closed afterwards).
+    """
+
+    def __init__(
+        self,
+        body=b"",
+        status: int = 200,
+        mimetype: str = "text/plain",
+        headers: dict | None = None,
+    ):
+        if isinstance(body, str):
+            body = body.encode()
+        self.body = body
+        self.status = status
+        content_type = mimetype
+        if mimetype.startswith("text/"):
+            content_type += "; charset=utf-8"
+        self.headers = {"Content-Type": content_type}
+        if headers:
+            self.headers.update(headers)
+
+    def set_etag(self, etag: str):
+        self.headers["ETag"] = f'"{etag}"'
+
+    def make_conditional(self, request: Request) -> "Response":
+        """Turn into a 304 if the client already has this ETag."""
+        etag = self.headers.get("ETag")
+        if etag is not None and request.method == "GET":
+            if_none_match = request.headers.get("If-None-Match", "")
+            if etag in (t.strip() for t in if_none_match.split(",")):
+                self.status = 304
+                self.body = b""
+        return self
+
+
+def _not_found() -> Response:
+    return Response("Not Found", status=404)
+
+
+class App:
+    """Route table mapping (method, path) to view functions."""
+
+    def __init__(self):
+        self._exact: dict[str, dict[str, object]] = {}
+        self._patterns: list[tuple[re.Pattern, dict[str, object]]] = []
+
+    def route(self, rule: str, methods=("GET",)):
+        """Register a view for rule; <name> segments become keyword args."""
+        def decorator(view):
+            if "<" in rule:
+                pattern = re.compile(
+                    "^" + re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", rule) + "$"
+                )
+                views = next(
+                    (v for p, v in self._patterns if p.pattern == pattern.pattern),
+                    None,
+                )
+                if views is None:
+                    views = {}
+                    self._patterns.append((pattern, views))
+            else:
+                views = self._exact.setdefault(rule, {})
+            for method in methods:
+                views[method] = view
+            return view
+        return decorator
+
+    def dispatch(self, request: Request) -> Response:
+        views = self._exact.get(request.path)
+        kwargs = {}
+        if views is None:
+            for pattern, candidate in self._patterns:
+                m = pattern.match(request.path)
+                if m:
+                    views, kwargs = candidate, m.groupdict()
+                    break
+            else:
+                return _not_found()
+
+        view = views.get(request.method)
+        if view is None:
+            return Response(
+                "Method Not Allowed",
+                status=405,
+                headers={"Allow": ", ".join(sorted(views))},
+            )
+        try:
+            return view(request, **kwargs)
+        except Exception:
+            log.exception("Error handling %s %s", request.method, request.path)
+            return Response("Internal Server Error", status=500)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive for the polling endpoints
+    server_version = "XM6Controller"
+
+    def do_GET(self):
+        self._handle()
+
+    def do_HEAD(self):
+        # Answered like GET, without the body
+        self._handle(head=True)
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self, head: bool = False):
+        # Only Content-Length bodies are read; anything else would be left
+        # on the keep-alive stream and parsed as the next request
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            self._reject(411, "Length Required", head)
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._reject(400, "Bad Request", head)
+            return
+
+        body = self.rfile.read(length) if length else b""
+        method = "GET" if head else self.command
+        request = Request(method, urlsplit(self.path).path, self.headers, body)
+        self._send(self.server.app.dispatch(request), head)
+
+    def _reject(self, status: int, reason: str, head: bool):
+        """Answer a request whose body cannot be read, then hang up."""
+        self.close_connection = True
+        response = Response(reason, status=status, headers={"Connection": "close"})
+        self._send(response, head)
+
+    def _send(self, response: Response, head: bool = False):
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+
+        body = response.body
+        if isinstance(body, (bytes, bytearray)):
+            if response.status != 304:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body and not head:
+                self.wfile.write(body)
+            return
+
+        # Streamed body: no length known up front, so end the connection
+        # when the stream ends
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            if head:
+                return
+            for chunk in body:
+                self.wfile.write(chunk.encode() if isinstance(chunk, str) else chunk)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away
+        finally:
+            close = getattr(body, "close", None)
+            if close is not None:
+                close()
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, app: App):
+        self.app = app
+        super().__init__(address, _Handler)
+
+    def server_bind(self):
+        # HTTPServer.server_bind() resolves the host with socket.getfqdn(),
+        # which can stall on a reverse DNS lookup; nothing here needs it
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = self.server_address[:2]
+
+
+def serve(app: App, host: str, port: int):
+    """Serve app forever (call from a daemon thread)."""
+    with _Server((host, port), app) as httpd:
+        httpd.serve_forever()
@@ -4,10 +4,106 @@ Build:
     pip install py2app
     python setup.py py2app
 
+Development build (alias mode: the bundle links to the source tree, so
+it does not need rebuilding after code changes):
+    XM6_ALIAS_BUILD=1 python setup.py py2app
+
+The bundle is built for arm64 only; for Intel Macs build a separate one:
+    XM6_ARCH=x86_64 python setup.py py2app
+py2app's arch option only selects the launcher stub, so after the build
+every binary in the bundle (Python library, extension modules) is thinned
+to that architecture with ditto and the bundle is ad-hoc re-signed.
+
+Optional compiled codec (protocol/_codec.pyx; the pure Python codec is
+used when it is not built):
+    pip install cython
+    python setup.py build_ext --inplace
+
 The resulting .app bundle is in dist/Sony XM6 Controller.app
+
+Builds are reproducible: the bundled .pyc files are the same for the
+same sources (see the py2app command below).
 """
 
+import glob
+import os
+import shutil
+import subprocess
+import sys
+
 from setuptools import setup
+from distutils import log  # after setuptools, which provides distutils
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    EXT_MODULES = []
+else:
+    EXT_MODULES = cythonize(["protocol/_codec.pyx"], language_level=3)
+
+ARCH = os.environ.get("XM6_ARCH", "arm64")
+
+
+def _thin_bundle(bundle: str, arch: str):
+    """Strip every universal binary in bundle down to arch, then re-sign.
+
+    Thinning invalidates the existing code signatures, and arm64 code
+    without a valid signature is killed at launch.
+    """
+    thinned = bundle + ".thin"
+    shutil.rmtree(thinned, ignore_errors=True)
+    subprocess.run(["ditto", "--arch", arch, bundle, thinned], check=True)
+    shutil.rmtree(bundle)
+    os.replace(thinned, bundle)
+    subprocess.run(
+        ["codesign", "--force", "--deep", "--sign", "-", bundle], check=True
+    )
+
+
+def _pin_bytecode_inputs():
+    """Make the bundled .pyc files depend on nothing but the sources.
+
+    The hash seed decides the order in which set and frozenset constants
+    are marshalled, and can only be set before the interpreter starts, so
+    the build re-executes itself once with PYTHONHASHSEED=0. A seed that
+    is already set is kept. SOURCE_DATE_EPOCH makes py_compile write
+    hash-based .pyc files instead of ones stamped with the source mtime.
+    """
+    os.environ.setdefault("SOURCE_DATE_EPOCH", "315532800")  # 1980-01-01
+    seed = os.environ.get("PYTHONHASHSEED")
+    if seed is None:
+        log.info("re-running the build with PYTHONHASHSEED=0")
+        env = dict(os.environ, PYTHONHASHSEED="0")
+        os.execve(sys.executable, [sys.executable, *sys.argv], env)
+    elif seed != "0":
+        log.warn(
+            "keeping PYTHONHASHSEED=%s; the bytecode will differ from "
+            "builds made with the default seed 0",
+            seed,
+        )
+
+
+try:
+    from py2app.build_app import py2app as _py2app
+except ImportError:  # fetched through setup_requires
+    CMDCLASS = {}
+else:
+
+    class py2app(_py2app):
+        """py2app, with reproducible bytecode and the bundle thinned to ARCH."""
+
+        def run(self):
+            if not self.alias:  # alias builds load the sources directly
+                _pin_bytecode_inputs()
+            super().run()
+            if self.alias:
+                return  # links to the source tree, nothing to thin
+            for bundle in glob.glob(os.path.join(self.dist_dir, "*.app")):
+                log.info("thinning %s to %s", bundle, ARCH)
+                _thin_bundle(bundle, ARCH)
+
+    CMDCLASS = {"py2app": py2app}
+
 
 APP = ["app.py"]
 
@@ -18,16 +114,50 @@ DATA_FILES = [
 
 OPTIONS = {
     "argv_emulation": False,
-    "packages": ["protocol", "bluetooth"],
+    # App modules are listed one by one instead of bundling the protocol
+    # and bluetooth packages wholesale; everything else is found by
+    # py2app's import tracer from app.py.
     "includes": [
-        "flask",
+        "bluetooth.connector",
+        "bluetooth._frameworks",
+        "protocol.codec",
+        "protocol.commands",
+        "protocol.constants",
+        "server",
+        "orjson",
         "objc",
         "Foundation",
         "AppKit",
-        "IOBluetooth",
+        "IOBluetooth",  # imported lazily via bluetooth._frameworks
         "CoreFoundation",
     ],
-    "resources": ["resources/icon.png", "resources/icon@2x.png"],
+    # Stdlib and build tooling that nothing in the app imports. email,
+    # xml and http stay: http.server parses headers with email, and
+    # plistlib needs xml.
+    "excludes": [
+        "tkinter",
+        "unittest",
+        "pydoc",
+        "doctest",
+        "lib2to3",
+        "idlelib",
+        "ensurepip",
+        "distutils",
+        "setuptools",
+        "pip",
+        # HTTP is served on localhost only; nothing needs TLS (http.client
+        # imports ssl optionally)
+        "ssl",
+    ],
+    # ...and so the OpenSSL TLS library need not be bundled. libcrypto
+    # stays: hashlib uses it.
+    "dylib_excludes": ["libssl.3.dylib"],
+    # No extra frameworks, and only the app's own dependencies on sys.path
+    "frameworks": [],
+    "site_packages": False,
+    # Menu bar template image (loaded at runtime); the app icon comes
+    # from iconfile below
+    "resources": ["resources/icon@2x.png"],
     "plist": {
         "CFBundleName": "Sony XM6 Controller",
         "CFBundleDisplayName": "Sony XM6 Controller",
@@ -35,19 +165,36 @@ OPTIONS = {
         "CFBundleVersion": "1.0.0",
         "CFBundleShortVersionString": "1.0.0",
         "LSUIElement": True,
+        "LSMinimumSystemVersion": "12.0",
         "NSBluetoothAlwaysUsageDescription": (
             "This app needs Bluetooth to communicate with "
             "your Sony WH-1000XM6 headphones."
         ),
+        "NSAppleEventsUsageDescription": (
+            "This app controls Spotify playback when system media "
+            "controls are unavailable."
+        ),
         "CFBundleIconFile": "AppIcon",
     },
     "iconfile": "resources/AppIcon.icns",
+    # Bundle .pyc without docstrings/asserts (py2app already zips them
+    # and strips the binaries by default)
+    "optimize": 2,
+    # One architecture per bundle instead of universal2: half the bytes
+    # for dyld to map at launch. This only picks the launcher stub; the
+    # py2app command above thins the rest of the bundle.
+    "arch": ARCH,
 }
 
+if os.environ.get("XM6_ALIAS_BUILD"):
+    OPTIONS["alias"] = True
+
 setup(
     name="Sony XM6 Controller",
     app=APP,
+    ext_modules=EXT_MODULES,
     data_files=DATA_FILES,
     options={"py2app": OPTIONS},
+    cmdclass=CMDCLASS,
     setup_requires=["py2app"],
 )
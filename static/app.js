@@ -18,6 +18,15 @@ async function api(method, path, body) {
     }
 }
 
+// Poll a background job (/api/devices, /api/connect) until it finishes
+async function waitForJob(job) {
+    while (true) {
+        const res = await api('GET', `/api/jobs/${job}`);
+        if (!res.pending) return res;
+        await new Promise(resolve => setTimeout(resolve, 500));
+    }
+}
+
 // --- Connection ---
 
 async function toggleConnection() {
@@ -28,18 +37,22 @@ async function toggleConnection() {
     if (isConnected) {
         await api('POST', '/api/disconnect');
     } else {
-        await api('POST', '/api/connect');
+        const res = await api('POST', '/api/connect');
+        if (res.job) await waitForJob(res.job);
     }
     await pollStatus();
     btn.disabled = false;
 }
 
-// --- Status polling ---
+// --- Status updates ---
 
 async function pollStatus() {
     const data = await api('GET', '/api/status');
     if (data.error) return;
+    renderStatus(data);
+}
 
+function renderStatus(data) {
     isConnected = data.connected;
 
     // Connection indicator
@@ -83,7 +96,13 @@ async function pollStatus() {
     document.getElementById('stcToggle').checked = data.speak_to_chat;
 }
 
-function startPolling() {
+function startStatusUpdates() {
+    // The server pushes status on change; poll only without EventSource
+    if (window.EventSource) {
+        const stream = new EventSource(API + '/api/status/stream');
+        stream.onmessage = (event) => renderStatus(JSON.parse(event.data));
+        return;
+    }
     pollStatus();
     pollTimer = setInterval(pollStatus, 5000);
 }
@@ -151,4 +170,4 @@ async function setSpeakToChat() {
 
 // --- Init ---
 
-document.addEventListener('DOMContentLoaded', startPolling);
+document.addEventListener('DOMContentLoaded', startStatusUpdates);